@@ -0,0 +1,64 @@
+"""
+Caching Helpers
+
+A tiny in-process TTL cache for async helpers whose results can be a little
+stale, e.g. encoded list responses for low-churn collections.
+"""
+
+import asyncio
+import functools
+import time
+
+
+def ttl_cache(ttl: float):
+    """Cache an async function's result per positional-argument tuple for ``ttl`` seconds.
+
+    Concurrent misses on the same key share a single in-flight call, so a
+    burst of requests after expiry (or after a clear) hits the backend once.
+    The wrapped function gets a ``cache_clear()`` method for invalidating the
+    cache after writes. Each process keeps its own cache.
+    """
+    def decorator(fn):
+        entries = {}
+        pending = {}
+        generation = 0
+
+        async def fetch(args, started, fetched_at):
+            value = await fn(*args)
+            # Don't store a result that a concurrent cache_clear() made stale
+            if started == generation:
+                entries[args] = (fetched_at, value)
+            return value
+
+        def done(args, task):
+            if pending.get(args) is task:
+                del pending[args]
+            if not task.cancelled():
+                task.exception()  # mark as retrieved if every waiter went away
+
+        @functools.wraps(fn)
+        async def wrapper(*args):
+            now = time.monotonic()
+            hit = entries.get(args)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            task = pending.get(args)
+            if task is None:
+                task = asyncio.ensure_future(fetch(args, generation, now))
+                pending[args] = task
+                task.add_done_callback(functools.partial(done, args))
+            # A cancelled waiter (e.g. a disconnected client) mustn't cancel
+            # the fetch the other waiters share
+            return await asyncio.shield(task)
+
+        def cache_clear():
+            nonlocal generation
+            generation += 1
+            entries.clear()
+            # Calls after a clear start a fresh fetch rather than joining one
+            # that may have read pre-write data
+            pending.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -1,11 +1,11 @@
 """
 Database Helper Functions
 
-MongoDB helper functions ready to use in your backend code.
-Import and use these functions in your API endpoints for database operations.
+Async MongoDB helper functions (motor) ready to use in your backend code.
+Import and await these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -22,11 +22,32 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    _client = AsyncIOMotorClient(database_url)
     db = _client[database_name]
 
+# Collection handles, created once per name and reused across requests
+_COLL = {}
+
+def _coll(name: str):
+    c = _COLL.get(name)
+    return c if c is not None else _COLL.setdefault(name, db[name])
+
+# Secondary indexes backing the app's filtered/sorted queries
+INDEXES = {
+    # list_messages: filter by channel, newest first
+    "message": [[("channel_id", 1), ("_id", -1)]],
+}
+
+async def ensure_indexes():
+    """Create the indexes in INDEXES (no-op for ones that already exist)"""
+    if db is None:
+        return
+    for collection_name, indexes in INDEXES.items():
+        for keys in indexes:
+            await _coll(collection_name).create_index(keys)
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,16 +61,24 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await _coll(collection_name).insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+def find_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
+    """Return an async cursor over documents, optionally restricted to the projected fields"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = _coll(collection_name).find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
-        cursor = cursor.limit(limit)
+        # Fetch the whole page in a single batch
+        cursor = cursor.limit(limit).batch_size(limit)
     
-    return list(cursor)
+    return cursor
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
+    """Get documents from collection"""
+    cursor = find_documents(collection_name, filter_dict, limit, projection, sort)
+    return await cursor.to_list(length=limit)
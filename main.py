@@ -1,13 +1,51 @@
 import os
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+import hashlib
+import logging
+import re
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
-from database import create_document, get_documents, db
-from schemas import Channel, Message, PaymentIntent, Project, Device
+import msgspec
 
-app = FastAPI(title="SOLA Vatzka Max 65 API", description="Backend services for futuristic music studio prototype")
+from cache import ttl_cache
+from schemas import (
+    Channel, Message, PaymentIntent, Project, Device,
+    ChannelRead, MessageRead, ProjectRead, DeviceRead,
+)
+from schemas_fast import (
+    ChannelIn, MessageIn, ChannelOut, MessageOut, ProjectOut, DeviceOut, encoder,
+    CHANNEL_PROJECTION, MESSAGE_PROJECTION, PROJECT_PROJECTION, DEVICE_PROJECTION,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered with the shared msgspec encoder"""
+
+    def render(self, content) -> bytes:
+        return encoder.encode(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await _init_database()
+    yield
+    _stop_background_tasks()
+
+
+app = FastAPI(
+    title="SOLA Vatzka Max 65 API",
+    description="Backend services for futuristic music studio prototype",
+    default_response_class=MsgspecJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,18 +56,83 @@ app.add_middleware(
 )
 
 
+# Database helpers are bound by _init_database() during lifespan startup, so
+# merely importing this module doesn't load motor or build the Mongo client.
+# (uvicorn runs startup before binding its socket, so this defers import-time
+# work only.) Until then the helpers fail with a clear error.
+def _database_not_initialised(*args, **kwargs):
+    raise RuntimeError("Database not initialised: the app's lifespan startup has not run")
+
+create_document = get_documents = _database_not_initialised
+db = None
+
+# Whether DATABASE_URL / DATABASE_NAME are set; captured at startup after
+# database.py has loaded .env
+_HAS_DB_URL = _HAS_DB_NAME = False
+_DB_NAME = None
+
+_indexes_task = _collections_task = None
+
+
+async def _init_database():
+    global create_document, get_documents, db, _HAS_DB_URL, _HAS_DB_NAME, _DB_NAME, _indexes_task, _collections_task
+    import database
+
+    create_document = database.create_document
+    get_documents = database.get_documents
+    db = database.db
+    _HAS_DB_URL = bool(database.database_url)
+    _HAS_DB_NAME = bool(database.database_name)
+    _DB_NAME = getattr(db, "name", "✅ Connected") if db is not None else None
+
+    # Both run in the background: with Mongo unreachable, the first command
+    # waits out the server-selection timeout, which mustn't hold up startup.
+    # /test reports connectivity issues.
+    if db is not None:
+        _indexes_task = asyncio.create_task(_ensure_indexes(database))
+        _collections_task = asyncio.create_task(_refresh_collection_names())
+
+
+async def _ensure_indexes(database):
+    try:
+        await database.ensure_indexes()
+    except Exception as e:
+        logger.warning("Could not create indexes: %s", e)
+
+
+def _stop_background_tasks():
+    for task in (_indexes_task, _collections_task):
+        if task is not None:
+            task.cancel()
+
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "SOLA Vatzka Max 65 backend running"}
 
 
 @app.get("/api/hello")
-def hello():
+async def hello():
     return {"message": "Hello from the backend API!"}
 
 
+# /test reports collection names from this cache, refreshed in the background
+# so health probes never trigger a listCollections round-trip themselves
+_COLLECTIONS_REFRESH = 60.0
+_COLLECTIONS_CACHE = []
+
+async def _refresh_collection_names():
+    global _COLLECTIONS_CACHE
+    while True:
+        try:
+            _COLLECTIONS_CACHE = await db.list_collection_names()
+        except Exception as e:
+            logger.warning("Could not list collections: %s", e)
+        await asyncio.sleep(_COLLECTIONS_REFRESH)
+
+
 @app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
     response = {
         "backend": "✅ Running",
@@ -44,11 +147,11 @@ def test_database():
         if db is not None:
             response["database"] = "✅ Available"
             response["database_url"] = "✅ Configured"
-            response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
+            response["database_name"] = _DB_NAME or "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
-                response["collections"] = collections[:10]
+                await db.command("hello")
+                response["collections"] = _COLLECTIONS_CACHE[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
                 response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
@@ -57,9 +160,8 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
-    import os as _os
-    response["database_url"] = "✅ Set" if _os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if _os.getenv("DATABASE_NAME") else "❌ Not Set"
+    response["database_url"] = "✅ Set" if _HAS_DB_URL else "❌ Not Set"
+    response["database_name"] = "✅ Set" if _HAS_DB_NAME else "❌ Not Set"
 
     return response
 
@@ -69,87 +171,190 @@ class SchemaResponse(BaseModel):
     name: str
     fields: List[str]
 
+# The schema list is static for the lifetime of the process, so build and
+# encode it once at import time.
+_SCHEMA_CACHE = tuple(
+    SchemaResponse(name=m.__name__.lower(), fields=list(m.model_fields))
+    for m in (Channel, Message, PaymentIntent, Project, Device)
+)
+_SCHEMA_BYTES = encoder.encode([s.model_dump() for s in _SCHEMA_CACHE])
+_SCHEMA_ETAG = '"%s"' % hashlib.blake2b(_SCHEMA_BYTES, digest_size=8).hexdigest()
+_SCHEMA_HEADERS = {"etag": _SCHEMA_ETAG, "cache-control": "public, max-age=300"}
+
 @app.get("/schema", response_model=List[SchemaResponse])
-def get_schema():
-    models = [Channel, Message, PaymentIntent, Project, Device]
-    out = []
-    for m in models:
-        out.append(SchemaResponse(name=m.__name__.lower(), fields=list(m.model_fields.keys())))
-    return out
+async def get_schema(request: Request):
+    # Let pollers revalidate with If-None-Match instead of re-downloading
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if _SCHEMA_ETAG in tags or "*" in tags:
+            return Response(status_code=304, headers=_SCHEMA_HEADERS)
+    return Response(content=_SCHEMA_BYTES, media_type="application/json", headers=_SCHEMA_HEADERS)
+
+
+def _stringify_id(doc, _str=str):
+    # Mongo always sets _id, so index directly; str is bound as a default to
+    # keep the lookup local in this per-row helper.
+    doc["_id"] = _str(doc["_id"])
+    return doc
+
+def _encode_row(struct, doc):
+    # Encode one stored document through its outbound struct. Collections can
+    # also be edited directly (e.g. in the Flames viewer), so a document that
+    # doesn't match the schema is passed through as stored rather than failing
+    # the whole list; one that can't be encoded at all is skipped.
+    doc = _stringify_id(doc)
+    try:
+        return encoder.encode(msgspec.convert(doc, struct))
+    except msgspec.ValidationError as e:
+        logger.warning("Document %s doesn't match %s: %s", doc["_id"], struct.__name__, e)
+    try:
+        return encoder.encode(doc)
+    except TypeError as e:
+        logger.warning("Skipping document %s: %s", doc["_id"], e)
+        return None
+
+def _encode_documents(struct, docs) -> bytes:
+    rows = [row for row in (_encode_row(struct, d) for d in docs) if row is not None]
+    return b"[" + b",".join(rows) + b"]"
+
+_ERROR_AT = re.compile(r"^(?P<msg>.*?)(?: - at `\$(?P<path>[^`]*)`)?$")
+_ERROR_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_ERROR_FIELD = (
+    (re.compile(r"^Object missing required field `(?P<field>[^`]+)`"), "missing"),
+    (re.compile(r"^Object contains unknown field `(?P<field>[^`]+)`"), "extra_forbidden"),
+)
+_ERROR_BYTE = re.compile(r"\(byte (\d+)\)")
+
+def _validation_error(e: msgspec.DecodeError, body: bytes) -> RequestValidationError:
+    # Translate a msgspec error into FastAPI's error list, so 422 responses
+    # look the same as on the Pydantic-validated endpoints
+    msg = str(e)
+    if not isinstance(e, msgspec.ValidationError):
+        byte = _ERROR_BYTE.search(msg)
+        pos = int(byte.group(1)) if byte else 0
+        return RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body", pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": msg}}],
+            body=body,
+        )
+
+    match = _ERROR_AT.match(msg)
+    msg, path = match["msg"], match["path"] or ""
+    loc = ["body"]
+    for key, index in _ERROR_PATH_PART.findall(path):
+        loc.append(key or int(index))
+    err_type = "value_error"
+    for pattern, kind in _ERROR_FIELD:
+        field = pattern.match(msg)
+        if field:
+            loc.append(field["field"])
+            err_type = kind
+            break
+    return RequestValidationError([{"type": err_type, "loc": tuple(loc), "msg": msg, "input": None}], body=body)
+
+async def _decode_body(request: Request, struct):
+    # Decode and validate the raw body in one msgspec pass instead of going
+    # through json.loads and a Pydantic model. strict=False matches Pydantic's
+    # lax mode (e.g. "500" is accepted for an int field).
+    body = await request.body()
+    try:
+        return msgspec.json.decode(body, type=struct, strict=False)
+    except msgspec.DecodeError as e:
+        raise _validation_error(e, body)
+
+def _json_body(struct):
+    # openapi_extra documenting a struct as the endpoint's JSON request body,
+    # since FastAPI can't infer it from a raw Request parameter
+    _, components = msgspec.json.schema_components([struct])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": components[struct.__name__]}},
+        }
+    }
 
 
 # ---------- Channels & Messaging (Bluetooth-like chat over web) ----------
-@app.get("/channels")
-def list_channels(limit: int = Query(20, ge=1, le=100)):
-    docs = get_documents("channel", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
-    return docs
-
-@app.post("/channels")
-def create_channel(ch: Channel):
-    _id = create_document("channel", ch)
+# Channels rarely change, so the encoded list is cached briefly and dropped
+# whenever a channel is created.
+@ttl_cache(ttl=2.0)
+async def _channels_payload(limit: int) -> bytes:
+    docs = await get_documents("channel", {}, limit, CHANNEL_PROJECTION)
+    return _encode_documents(ChannelOut, docs)
+
+@app.get("/channels", response_model=List[ChannelRead])
+async def list_channels(limit: int = Query(20, ge=1, le=100)):
+    return Response(content=await _channels_payload(limit), media_type="application/json")
+
+@app.post("/channels", openapi_extra=_json_body(ChannelIn))
+async def create_channel(request: Request):
+    ch = await _decode_body(request, ChannelIn)
+    _id = await create_document("channel", msgspec.structs.asdict(ch))
+    _channels_payload.cache_clear()
     return {"id": _id}
 
-@app.get("/messages")
-def list_messages(channel_id: Optional[str] = None, limit: int = Query(50, ge=1, le=200)):
+@app.get("/messages", response_model=List[MessageRead])
+async def list_messages(channel_id: Optional[str] = None, limit: int = Query(50, ge=1, le=200)):
     filt = {"channel_id": channel_id} if channel_id else {}
-    docs = get_documents("message", filt, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
-    return docs
-
-@app.post("/messages")
-def create_message(msg: Message):
-    _id = create_document("message", msg)
+    docs = await get_documents("message", filt, limit, MESSAGE_PROJECTION, sort=[("_id", -1)])
+    return Response(content=_encode_documents(MessageOut, docs), media_type="application/json")
+
+@app.post("/messages", openapi_extra=_json_body(MessageIn))
+async def create_message(request: Request):
+    msg = await _decode_body(request, MessageIn)
+    _id = await create_document("message", msgspec.structs.asdict(msg))
     return {"id": _id}
 
 
 # ---------- Projects ----------
-@app.get("/projects")
-def list_projects(limit: int = Query(20, ge=1, le=100)):
-    docs = get_documents("project", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
-    return docs
+@app.get("/projects", response_model=List[ProjectRead])
+async def list_projects(limit: int = Query(20, ge=1, le=100)):
+    docs = await get_documents("project", {}, limit, PROJECT_PROJECTION)
+    return Response(content=_encode_documents(ProjectOut, docs), media_type="application/json")
 
 @app.post("/projects")
-def create_project(project: Project):
-    _id = create_document("project", project)
+async def create_project(project: Project):
+    _id = await create_document("project", project)
     return {"id": _id}
 
 
 # ---------- Devices (MIDI/OTG/Bluetooth metadata only) ----------
-@app.get("/devices")
-def list_devices(limit: int = Query(50, ge=1, le=200)):
-    docs = get_documents("device", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
-    return docs
+# Cached like channels: registrations are rare compared to reads
+@ttl_cache(ttl=2.0)
+async def _devices_payload(limit: int) -> bytes:
+    docs = await get_documents("device", {}, limit, DEVICE_PROJECTION)
+    return _encode_documents(DeviceOut, docs)
+
+@app.get("/devices", response_model=List[DeviceRead])
+async def list_devices(limit: int = Query(50, ge=1, le=200)):
+    return Response(content=await _devices_payload(limit), media_type="application/json")
 
 @app.post("/devices")
-def register_device(device: Device):
-    _id = create_document("device", device)
+async def register_device(device: Device):
+    _id = await create_document("device", device)
+    _devices_payload.cache_clear()
     return {"id": _id}
 
 
 # ---------- Payments (mock intent) ----------
-class CreatePaymentRequest(BaseModel):
+class CreatePaymentRequest(msgspec.Struct, kw_only=True):
     user_email: str
     plan: str
-    amount_cents: int
+    amount_cents: Annotated[int, msgspec.Meta(ge=0)]
     currency: str = "USD"
 
-@app.post("/payments/intent")
-def create_payment_intent(data: CreatePaymentRequest):
-    intent = PaymentIntent(
+@app.post("/payments/intent", openapi_extra=_json_body(CreatePaymentRequest))
+async def create_payment_intent(request: Request):
+    data = await _decode_body(request, CreatePaymentRequest)
+    # Every field was just validated by CreatePaymentRequest (or is a literal)
+    intent = PaymentIntent.model_construct(
         user_email=data.user_email,
         plan=data.plan,
         amount_cents=data.amount_cents,
         currency=data.currency,
         status="created",
     )
-    _id = create_document("paymentintent", intent)
+    _id = await create_document("paymentintent", intent)
     return {"id": _id, "status": "created"}
 
 
@@ -157,15 +362,18 @@ def create_payment_intent(data: CreatePaymentRequest):
 class AssistantMessage(BaseModel):
     prompt: str
 
+# Simple, optimistic mocked reply for demo purposes. Everything but the prompt
+# is constant, so the envelope is encoded once and only the prompt is appended.
+_REPLY = (
+    "SOLA Vatzka Max 65 online. I can route your MIDI to external devices, "
+    "set BPM and key, and configure mixers and futuristic EQs. "
+    "Tell me the vibe and I’ll scaffold a project for you."
+)
+_REPLY_PREFIX = encoder.encode({"assistant": "solavatzkamax65", "reply": _REPLY})[:-1] + b',"prompt":'
+
 @app.post("/assistant/sola")
-def assistant_reply(msg: AssistantMessage):
-    # Simple, optimistic mocked reply for demo purposes
-    reply = (
-        "SOLA Vatzka Max 65 online. I can route your MIDI to external devices, "
-        "set BPM and key, and configure mixers and futuristic EQs. "
-        "Tell me the vibe and I’ll scaffold a project for you."
-    )
-    return {"assistant": "solavatzkamax65", "prompt": msg.prompt, "reply": reply}
+async def assistant_reply(msg: AssistantMessage):
+    return Response(content=_REPLY_PREFIX + encoder.encode(msg.prompt) + b"}", media_type="application/json")
 
 
 if __name__ == "__main__":
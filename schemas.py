@@ -11,8 +11,14 @@ Model name is converted to lowercase for the collection name:
 - BlogPost -> "blogs" collection
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
+from datetime import datetime
+
+# Shared model config: reject unknown keys and make instances immutable.
+# Schemas are built eagerly at class creation (defer_build is off by default),
+# so there's no first-request compile cost.
+MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 # Example schemas (replace with your own):
 
@@ -21,6 +27,7 @@ class User(BaseModel):
     Users collection schema
     Collection name: "user" (lowercase of class name)
     """
+    model_config = MODEL_CONFIG
     name: str = Field(..., description="Full name")
     email: str = Field(..., description="Email address")
     address: str = Field(..., description="Address")
@@ -32,6 +39,7 @@ class Product(BaseModel):
     Products collection schema
     Collection name: "product" (lowercase of class name)
     """
+    model_config = MODEL_CONFIG
     title: str = Field(..., description="Product title")
     description: Optional[str] = Field(None, description="Product description")
     price: float = Field(..., ge=0, description="Price in dollars")
@@ -42,11 +50,13 @@ class Product(BaseModel):
 
 class Channel(BaseModel):
     """Realtime comm channel (e.g., Bluetooth chat room)"""
+    model_config = MODEL_CONFIG
     name: str = Field(..., description="Channel name")
     topic: Optional[str] = Field(None, description="Channel topic")
 
 class Message(BaseModel):
     """Messages sent within a channel"""
+    model_config = MODEL_CONFIG
     channel_id: str = Field(..., description="Channel identifier")
     sender: str = Field(..., description="Display name of sender")
     text: Optional[str] = Field(None, description="Plain text message")
@@ -54,6 +64,7 @@ class Message(BaseModel):
 
 class PaymentIntent(BaseModel):
     """Payment record for subscriptions or purchases"""
+    model_config = MODEL_CONFIG
     user_email: str = Field(..., description="Purchaser email")
     plan: str = Field(..., description="Plan or product id")
     amount_cents: int = Field(..., ge=0, description="Amount in cents")
@@ -62,6 +73,7 @@ class PaymentIntent(BaseModel):
 
 class Project(BaseModel):
     """Music project sessions metadata"""
+    model_config = MODEL_CONFIG
     title: str
     bpm: int = Field(120, ge=40, le=300)
     key: str = Field("C Major")
@@ -69,10 +81,33 @@ class Project(BaseModel):
 
 class Device(BaseModel):
     """External MIDI/OTG device metadata"""
+    model_config = MODEL_CONFIG
     name: str
     manufacturer: Optional[str] = None
     connection: str = Field(..., description="Connection type: midi, bluetooth, otg")
 
+# Read models (documents as stored, returned by the list endpoints). These
+# declare the response schema in OpenAPI; at runtime the endpoints encode
+# through the msgspec mirrors in schemas_fast.py instead.
+
+class StoredDocument(BaseModel):
+    """Fields added by the database helpers on insert"""
+    id: str = Field(..., alias="_id", description="Stringified ObjectId")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ChannelRead(Channel, StoredDocument):
+    pass
+
+class MessageRead(Message, StoredDocument):
+    pass
+
+class ProjectRead(Project, StoredDocument):
+    pass
+
+class DeviceRead(Device, StoredDocument):
+    pass
+
 # Note: The Flames database viewer will automatically:
 # 1. Read these schemas from GET /schema endpoint
 # 2. Use them for document validation when creating/editing
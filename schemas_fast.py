@@ -0,0 +1,70 @@
+"""
+Fast-path Schemas
+
+msgspec mirrors of the collection schemas in schemas.py. Documents coming
+back from MongoDB are converted into the *Out structs and encoded in one
+pass by msgspec's C encoder. The *In structs decode request bodies for the
+simple, constraint-free POST endpoints; the rest are still validated with
+the Pydantic models.
+
+Keep the fields here in sync with schemas.py.
+"""
+
+import msgspec
+from datetime import datetime
+from typing import Optional, List
+
+
+class StoredDocument(msgspec.Struct, kw_only=True):
+    """Fields added by the database helpers on insert"""
+    _id: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ChannelOut(StoredDocument, kw_only=True):
+    name: str
+    topic: Optional[str] = None
+
+class MessageOut(StoredDocument, kw_only=True):
+    channel_id: str
+    sender: str
+    text: Optional[str] = None
+    voice_url: Optional[str] = None
+
+class ProjectOut(StoredDocument, kw_only=True):
+    title: str
+    bpm: int = 120
+    key: str = "C Major"
+    tracks: List[str] = []
+
+class DeviceOut(StoredDocument, kw_only=True):
+    name: str
+    manufacturer: Optional[str] = None
+    connection: str
+
+
+# Inbound request bodies (unknown keys rejected, like the Pydantic models)
+
+class ChannelIn(msgspec.Struct, kw_only=True, forbid_unknown_fields=True):
+    name: str
+    topic: Optional[str] = None
+
+class MessageIn(msgspec.Struct, kw_only=True, forbid_unknown_fields=True):
+    channel_id: str
+    sender: str
+    text: Optional[str] = None
+    voice_url: Optional[str] = None
+
+
+def projection(struct) -> dict:
+    """MongoDB projection that fetches only the fields a struct encodes"""
+    return {name: 1 for name in struct.__struct_fields__}
+
+# Projections used by the list endpoints
+CHANNEL_PROJECTION = projection(ChannelOut)  # /channels
+MESSAGE_PROJECTION = projection(MessageOut)  # /messages
+PROJECT_PROJECTION = projection(ProjectOut)  # /projects
+DEVICE_PROJECTION = projection(DeviceOut)    # /devices
+
+# Shared encoder, reused across requests
+encoder = msgspec.json.Encoder()
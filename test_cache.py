@@ -0,0 +1,139 @@
+"""
+Tests for cache.ttl_cache.
+"""
+
+import asyncio
+
+import pytest
+
+import cache
+from cache import ttl_cache
+
+
+class Clock:
+    """Real monotonic time plus an offset the test can advance.
+
+    time.monotonic is patched module-wide, and asyncio uses it too, so the
+    clock must keep moving for sleeps to finish.
+    """
+
+    def __init__(self, real):
+        self.real = real
+        self.offset = 0.0
+
+    def advance(self, seconds):
+        self.offset += seconds
+
+    def __call__(self):
+        return self.real() + self.offset
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(cache.time.monotonic)
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def _counting(delay=0.0):
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        n = len(calls)
+        await asyncio.sleep(delay)
+        return f"{key}-{n}"
+
+    return fetch, calls
+
+
+def test_hit_within_ttl_and_refetch_after_expiry(clock):
+    fetch, calls = _counting()
+    cached = ttl_cache(ttl=2.0)(fetch)
+
+    async def run():
+        assert await cached("a") == "a-1"
+        clock.advance(1.9)
+        assert await cached("a") == "a-1"
+        clock.advance(0.2)
+        assert await cached("a") == "a-2"
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
+
+
+def test_keys_are_cached_separately(clock):
+    fetch, calls = _counting()
+    cached = ttl_cache(ttl=2.0)(fetch)
+
+    async def run():
+        await cached("a")
+        await cached("b")
+        await cached("a")
+
+    asyncio.run(run())
+    assert calls == ["a", "b"]
+
+
+def test_concurrent_misses_share_one_call(clock):
+    fetch, calls = _counting(delay=0.01)
+    cached = ttl_cache(ttl=2.0)(fetch)
+
+    async def run():
+        return await asyncio.gather(*(cached("a") for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert calls == ["a"]
+    assert set(results) == {"a-1"}
+
+
+def test_cache_clear_drops_entries(clock):
+    fetch, calls = _counting()
+    cached = ttl_cache(ttl=2.0)(fetch)
+
+    async def run():
+        await cached("a")
+        cached.cache_clear()
+        assert await cached("a") == "a-2"
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
+
+
+def test_clear_during_fetch_is_not_overwritten(clock):
+    fetch, calls = _counting(delay=0.01)
+    cached = ttl_cache(ttl=2.0)(fetch)
+
+    async def run():
+        first = asyncio.ensure_future(cached("a"))
+        await asyncio.sleep(0)  # let the fetch start
+        cached.cache_clear()
+        # Doesn't join the pre-clear fetch
+        second = await cached("a")
+        assert await first == "a-1"
+        assert second == "a-2"
+        # The stale pre-clear result was not stored
+        assert await cached("a") == "a-2"
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
+
+
+def test_errors_propagate_and_are_not_cached(clock):
+    calls = []
+
+    async def flaky(key):
+        calls.append(key)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    cached = ttl_cache(ttl=2.0)(flaky)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cached("a")
+        assert await cached("a") == "ok"
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
@@ -0,0 +1,95 @@
+"""
+Tests for the msgspec request-body path in main.py.
+
+The 422 translation parses msgspec's error messages, so these pin down each
+mapped case against the msgspec version in requirements.txt.
+"""
+
+from typing import List
+
+import msgspec
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    created = []
+
+    async def fake_create_document(collection_name, data):
+        created.append((collection_name, data))
+        return "fake-id"
+
+    monkeypatch.setattr(main, "create_document", fake_create_document)
+    client = TestClient(main.app)
+    client.created = created
+    return client
+
+
+def _errors(response):
+    assert response.status_code == 422
+    return response.json()["detail"]
+
+
+def test_wrong_type_maps_to_field_loc(client):
+    [err] = _errors(client.post("/channels", json={"name": 5}))
+    assert err["type"] == "value_error"
+    assert err["loc"] == ["body", "name"]
+    assert err["msg"] == "Expected `str`, got `int`"
+
+
+def test_missing_field(client):
+    [err] = _errors(client.post("/messages", json={"channel_id": "c1"}))
+    assert err["type"] == "missing"
+    assert err["loc"] == ["body", "sender"]
+
+
+def test_unknown_field(client):
+    [err] = _errors(client.post("/channels", json={"name": "a", "zz": 1}))
+    assert err["type"] == "extra_forbidden"
+    assert err["loc"] == ["body", "zz"]
+
+
+def test_constraint_violation(client):
+    body = {"user_email": "e", "plan": "p", "amount_cents": -1}
+    [err] = _errors(client.post("/payments/intent", json=body))
+    assert err["type"] == "value_error"
+    assert err["loc"] == ["body", "amount_cents"]
+
+
+def test_malformed_json(client):
+    [err] = _errors(client.post("/channels", content=b"{bad"))
+    assert err["type"] == "json_invalid"
+    assert err["loc"] == ["body", 1]
+
+
+def test_non_object_body(client):
+    [err] = _errors(client.post("/channels", json=[]))
+    assert err["loc"] == ["body"]
+
+
+def test_nested_path():
+    class Tracks(msgspec.Struct):
+        tracks: List[str]
+
+    body = b'{"tracks": ["a", 1]}'
+    with pytest.raises(msgspec.ValidationError) as exc:
+        msgspec.json.decode(body, type=Tracks)
+    [err] = main._validation_error(exc.value, body).errors()
+    assert err["loc"] == ("body", "tracks", 1)
+
+
+def test_lax_coercion_matches_pydantic(client):
+    body = {"user_email": "e", "plan": "p", "amount_cents": "500"}
+    response = client.post("/payments/intent", json=body)
+    assert response.status_code == 200
+    [(collection, intent)] = client.created
+    assert collection == "paymentintent"
+    assert intent.amount_cents == 500
+
+
+def test_payment_request_ignores_extra_keys(client):
+    body = {"user_email": "e", "plan": "p", "amount_cents": 5, "coupon": "X"}
+    assert client.post("/payments/intent", json=body).status_code == 200